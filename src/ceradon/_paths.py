@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+import pathlib
+
+# Repository root (holds data/ and sample_builds/); resolved once for every module
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[2]
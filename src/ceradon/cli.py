@@ -1,38 +1,41 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import pathlib
 import sys
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from .data_loader import find_by_id, load_components
-from .estimator import estimate_node, format_report
-from .models import NodeBuild
-from .mission_project import (
-    LEGACY_SCHEMA_TAG,
-    assemble_node_bundle,
-    assemble_project,
-    parse_project,
-    project_to_builds,
-    to_cot_stub,
-    to_geojson,
-)
+from ._paths import PROJECT_ROOT
 
-PRESET_DIR = pathlib.Path(__file__).resolve().parents[2] / "sample_builds"
+if TYPE_CHECKING:
+    from .models import NodeBuild
 
+# Estimator, catalog, and MissionProject modules are imported inside the commands that
+# need them so `--help`, `presets`, and argument errors skip loading them entirely.
 
-def parse_build(config_path: pathlib.Path):
-    inventory = load_components()
-    with config_path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+PRESET_DIR = PROJECT_ROOT / "sample_builds"
+
+ENVIRONMENT_CHOICES = ("lab", "urban_indoor", "urban_outdoor", "rural_open", "subterranean")
+ALTITUDE_BAND_CHOICES = ("sea_level", "band_1000_2000", "band_2000_3000", "above_3000")
+TEMPERATURE_BAND_CHOICES = ("hot", "temperate", "cold", "very_cold")
+
+
+def parse_build(config_path: pathlib.Path, index: Optional[Dict[str, Dict[str, object]]] = None):
+    from .data_loader import find_by_id, load_component_index
+    from .models import NodeBuild
 
-    host = find_by_id(inventory["hosts"], data["host"])
-    radio = find_by_id(inventory["radios"], data["radio"])
-    antenna = find_by_id(inventory["antennas"], data["antenna"])
-    battery = find_by_id(inventory["batteries"], data["battery"])
+    if index is None:
+        index = load_component_index()
+    data = json.loads(config_path.read_bytes())
+
+    host = find_by_id(index["hosts"], data["host"])
+    radio = find_by_id(index["radios"], data["radio"])
+    antenna = find_by_id(index["antennas"], data["antenna"])
+    battery = find_by_id(index["batteries"], data["battery"])
     sensor_ids: List[str] = data.get("sensors", [])
-    sensors = [find_by_id(inventory["sensors"], sid) for sid in sensor_ids]
+    sensors = [find_by_id(index["sensors"], sid) for sid in sensor_ids]
     environment = data.get("environment", "rural_open")
 
     return NodeBuild(
@@ -45,18 +48,29 @@ def parse_build(config_path: pathlib.Path):
     )
 
 
-def _build_and_estimate(config_path: pathlib.Path, environment_override: Optional[str] = None) -> Tuple[NodeBuild, object]:
-    build = parse_build(config_path)
+def _build_and_estimate(
+    config_path: pathlib.Path,
+    environment_override: Optional[str] = None,
+    index: Optional[Dict[str, Dict[str, object]]] = None,
+) -> Tuple[NodeBuild, object]:
+    from dataclasses import replace
+
+    from .estimator import estimate_node
+
+    build = parse_build(config_path, index)
     if environment_override:
-        build.environment = environment_override
+        build = replace(build, environment=environment_override)
     estimate = estimate_node(build)
     return build, estimate
 
 
 def list_components():
+    from .data_loader import load_components
+
     inventory = load_components()
+    lines: List[str] = []
     for key, items in inventory.items():
-        print(f"{key.upper()}")
+        lines.append(key.upper())
         for item in items:
             if key == "batteries":
                 extra = f"{item.capacity_wh} Wh, {item.chemistry}"
@@ -67,15 +81,17 @@ def list_components():
                 extra = f"{item.radio_type}, {bands}"
             else:
                 extra = item.notes or ""
-            print(f"- {item.id}: {item.name} ({extra})")
-        print("")
+            lines.append(f"- {item.id}: {item.name} ({extra})")
+        lines.append("")
+    # One write for the whole catalog instead of a print() per component
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def simulate(config_path: pathlib.Path):
-    build = parse_build(config_path)
-    estimate = estimate_node(build)
-    report = format_report(build, estimate)
-    print(report)
+def simulate(config_path: pathlib.Path, environment_override: Optional[str] = None):
+    from .estimator import format_report
+
+    build, estimate = _build_and_estimate(config_path, environment_override)
+    print(format_report(build, estimate))
 
 
 def export_node_bundle(
@@ -86,18 +102,24 @@ def export_node_bundle(
     altitude_band: str,
     temperature_band: str,
     environment_override: Optional[str] = None,
+    compact: bool = False,
 ):
+    from .data_loader import load_component_index
+    from .mission_project import assemble_node_bundle, write_project
+
     inventory_paths = list(config_paths)
     inventory_paths.extend(resolve_preset(name) for name in preset_names)
     if not inventory_paths:
         raise ValueError("At least one --config or --preset is required to export a bundle")
 
+    # Shared across nodes: the catalog index and the (read-only) band location
+    index = load_component_index()
+    location = {"altitude_band": altitude_band, "temperature_band": temperature_band}
     builds: List[Tuple[str, NodeBuild, object, List[str], str, Dict[str, float]]] = []
     for config_path in inventory_paths:
-        build, estimate = _build_and_estimate(config_path, environment_override)
+        build, estimate = _build_and_estimate(config_path, environment_override, index)
         node_id = f"node-{config_path.stem}"
         node_label = config_path.stem.replace("_", " ")
-        location = {"altitude_band": altitude_band, "temperature_band": temperature_band}
         builds.append((node_id, build, estimate, [estimate.recommended_role], node_label, location))
 
     bundle = assemble_node_bundle(
@@ -106,8 +128,7 @@ def export_node_bundle(
         temperature_band=temperature_band,
         mission={"name": mission_name},
     )
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(bundle, handle, indent=2)
+    write_project(bundle, output_path, compact)
     print(f"MissionProject bundle written to {output_path}")
 
 
@@ -122,7 +143,10 @@ def export_mission_project(
     lon: Optional[float] = None,
     elevation_m: Optional[float] = None,
     schema_version: str = None,
+    compact: bool = False,
 ):
+    from .mission_project import assemble_project, write_project
+
     build, estimate = _build_and_estimate(config_path, environment_override)
     node_id = f"node-{config_path.stem}"
     node_label = config_path.stem.replace("_", " ")
@@ -152,12 +176,15 @@ def export_mission_project(
         environment={"propagation": build.environment, "altitude_band": altitude_band, "temperature_band": temperature_band},
         schema_version=schema_version,
     )
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(project, handle, indent=2)
+    write_project(project, output_path, compact)
     print(f"MissionProject written to {output_path}")
 
 
 def import_mission_project(path: pathlib.Path, simulate: bool = False):
+    from .data_loader import load_components
+    from .estimator import estimate_node, format_report
+    from .mission_project import parse_project, project_to_builds
+
     inventory = load_components()
     project = parse_project(path)
     builds, warnings = project_to_builds(project, inventory)
@@ -169,28 +196,33 @@ def import_mission_project(path: pathlib.Path, simulate: bool = False):
 
 
 def atak_export(path: pathlib.Path, geojson_path: Optional[pathlib.Path], cot_path: Optional[pathlib.Path]):
+    from .mission_project import parse_project, to_cot_stub, to_geojson, write_project
+
     project = parse_project(path)
     if geojson_path:
         geojson = to_geojson(project)
-        with geojson_path.open("w", encoding="utf-8") as handle:
-            json.dump(geojson, handle, indent=2)
+        write_project(geojson, geojson_path)
         print(f"GeoJSON written to {geojson_path}")
     if cot_path:
         cot = to_cot_stub(project)
-        with cot_path.open("w", encoding="utf-8") as handle:
-            json.dump(cot, handle, indent=2)
+        write_project(cot, cot_path)
         print(f"CoT stub written to {cot_path}")
 
 
+def _preset_names() -> Tuple[str, ...]:
+    """Preset stems for argparse ``choices``; a single glob, no preset file is opened."""
+
+    if not PRESET_DIR.exists():
+        return ()
+    return tuple(preset_file.stem for preset_file in sorted(PRESET_DIR.glob("*.json")))
+
+
 def list_presets() -> List[Tuple[str, str]]:
     presets: List[Tuple[str, str]] = []
-    if not PRESET_DIR.exists():
-        return presets
-    for preset_file in sorted(PRESET_DIR.glob("*.json")):
-        with preset_file.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
+    for name in _preset_names():
+        data = json.loads((PRESET_DIR / f"{name}.json").read_bytes())
         description = data.get("description", "")
-        presets.append((preset_file.stem, description))
+        presets.append((name, description))
     return presets
 
 
@@ -201,7 +233,7 @@ def resolve_preset(name: str) -> pathlib.Path:
     return preset_path
 
 
-def build_arg_parser() -> argparse.ArgumentParser:
+def build_arg_parser(preset_choices: Optional[Tuple[str, ...]] = None) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Ceradon Node Architect: estimate power, runtime, and roles for RF/sensor nodes (MissionProject schema v2.0.0 exports by default)",
     )
@@ -211,14 +243,15 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
     presets = sub.add_parser("presets", help="List bundled sample builds")
 
-    preset_choices = [name for name, _ in list_presets()]
+    if preset_choices is None:
+        preset_choices = _preset_names()
 
     sim = sub.add_parser("simulate", help="Simulate a build from a JSON config")
     sim.add_argument("config", nargs="?", type=pathlib.Path, help="Path to build JSON")
     sim.add_argument("--preset", choices=preset_choices, help="Preset name from sample_builds")
     sim.add_argument(
         "--environment",
-        choices=["lab", "urban_indoor", "urban_outdoor", "rural_open", "subterranean"],
+        choices=ENVIRONMENT_CHOICES,
         help="Override environment assumption for range/power scaling",
     )
 
@@ -230,16 +263,16 @@ def build_arg_parser() -> argparse.ArgumentParser:
     export_mp.add_argument(
         "--altitude-band",
         default="band_2000_3000",
-        choices=["sea_level", "band_1000_2000", "band_2000_3000", "above_3000"],
+        choices=ALTITUDE_BAND_CHOICES,
     )
     export_mp.add_argument(
         "--temperature-band",
         default="very_cold",
-        choices=["hot", "temperate", "cold", "very_cold"],
+        choices=TEMPERATURE_BAND_CHOICES,
     )
     export_mp.add_argument(
         "--environment",
-        choices=["lab", "urban_indoor", "urban_outdoor", "rural_open", "subterranean"],
+        choices=ENVIRONMENT_CHOICES,
         help="Override environment assumption",
     )
     export_mp.add_argument("--lat", type=float)
@@ -250,6 +283,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Deprecated: emit legacy mission_project_v1 schema instead of schemaVersion 2.0.0",
     )
+    export_mp.add_argument("--compact", action="store_true", help="Write minified UTF-8 JSON")
 
     export_bundle = sub.add_parser(
         "export-bundle", help="Export a MissionProject node bundle skeleton (schema v2.0.0)"
@@ -261,18 +295,19 @@ def build_arg_parser() -> argparse.ArgumentParser:
     export_bundle.add_argument(
         "--altitude-band",
         default="band_2000_3000",
-        choices=["sea_level", "band_1000_2000", "band_2000_3000", "above_3000"],
+        choices=ALTITUDE_BAND_CHOICES,
     )
     export_bundle.add_argument(
         "--temperature-band",
         default="cold",
-        choices=["hot", "temperate", "cold", "very_cold"],
+        choices=TEMPERATURE_BAND_CHOICES,
     )
     export_bundle.add_argument(
         "--environment",
-        choices=["lab", "urban_indoor", "urban_outdoor", "rural_open", "subterranean"],
+        choices=ENVIRONMENT_CHOICES,
         help="Override environment assumption for all bundle nodes",
     )
+    export_bundle.add_argument("--compact", action="store_true", help="Write minified UTF-8 JSON")
 
     import_mp = sub.add_parser("import-mission", help="Import a MissionProject JSON and list usable builds")
     import_mp.add_argument("mission_file", type=pathlib.Path)
@@ -286,9 +321,24 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def get_parser() -> argparse.ArgumentParser:
+    """Parser shared by repeated in-process ``main()`` calls (batch scripts, tests).
+
+    The preset directory is re-listed on every call and the parser is rebuilt only when
+    that listing changes, so presets added mid-process show up as ``--preset`` choices.
+    """
+
+    return _parser_for_presets(_preset_names())
+
+
+@functools.lru_cache(maxsize=1)
+def _parser_for_presets(preset_names: Tuple[str, ...]) -> argparse.ArgumentParser:
+    return build_arg_parser(preset_names)
+
+
 def main(argv=None):
     argv = argv or sys.argv[1:]
-    parser = build_arg_parser()
+    parser = get_parser()
     args = parser.parse_args(argv)
 
     if args.command == "list":
@@ -303,14 +353,15 @@ def main(argv=None):
             config_path = resolve_preset(args.preset)
         if not config_path:
             parser.error("simulate requires a config path or --preset")
-        build, estimate = _build_and_estimate(config_path, args.environment)
-        print(format_report(build, estimate))
+        simulate(config_path, args.environment)
     elif args.command == "export-mission":
         config_path = args.config
         if args.preset:
             config_path = resolve_preset(args.preset)
         if not config_path:
             parser.error("export-mission requires a config path or --preset")
+        from .mission_project import LEGACY_SCHEMA_TAG
+
         schema_version = LEGACY_SCHEMA_TAG if args.export_mission_v1 else None
         export_mission_project(
             config_path=config_path,
@@ -323,6 +374,7 @@ def main(argv=None):
             lon=args.lon,
             elevation_m=args.elevation_m,
             schema_version=schema_version,
+            compact=args.compact,
         )
     elif args.command == "export-bundle":
         config_paths = args.config or []
@@ -338,6 +390,7 @@ def main(argv=None):
                 altitude_band=args.altitude_band,
                 temperature_band=args.temperature_band,
                 environment_override=args.environment,
+                compact=args.compact,
             )
         except ValueError as exc:
             parser.error(str(exc))
@@ -1,27 +1,52 @@
 from __future__ import annotations
 
+import functools
 import json
 import pathlib
-from typing import Dict, List
+from typing import Dict, List, Mapping
 
+from ._paths import PROJECT_ROOT
+from .estimator import CatalogArrays, build_catalog_arrays
 from .models import Antenna, Battery, Host, Radio, Sensor
 
-DEFAULT_DATA_PATH = pathlib.Path(__file__).resolve().parents[2] / "data" / "default_components.json"
+DEFAULT_DATA_PATH = PROJECT_ROOT / "data" / "default_components.json"
 
 
 def _load_json(path: pathlib.Path) -> Dict:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return json.loads(path.read_bytes())
 
 
 def load_components(path: pathlib.Path = DEFAULT_DATA_PATH) -> Dict[str, List]:
+    """Load the component catalog, parsing each resolved path at most once per process.
+
+    The returned inventory is shared between callers and must be treated as read-only.
+    """
+
+    return _load_components(_resolved(path))
+
+
+def load_component_index(path: pathlib.Path = DEFAULT_DATA_PATH) -> Dict[str, Dict[str, object]]:
+    """Cached ``index_components`` view of ``load_components``."""
+
+    return _load_component_index(_resolved(path))
+
+
+def _resolved(path: pathlib.Path) -> pathlib.Path:
+    # DEFAULT_DATA_PATH is already absolute; skip the realpath syscalls on the common path
+    if path is DEFAULT_DATA_PATH:
+        return path
+    return pathlib.Path(path).resolve()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_components(path: pathlib.Path) -> Dict[str, List]:
     data = _load_json(path)
 
-    hosts = [Host(**item, category="host") for item in data.get("hosts", [])]
-    radios = [Radio(**item, category="radio") for item in data.get("radios", [])]
-    antennas = [Antenna(**item, category="antenna") for item in data.get("antennas", [])]
-    batteries = [Battery(**item, category="battery") for item in data.get("batteries", [])]
-    sensors = [Sensor(**item, category="sensor") for item in data.get("sensors", [])]
+    hosts = [Host.from_spec(item, category="host") for item in data.get("hosts", [])]
+    radios = [Radio.from_spec(item, category="radio") for item in data.get("radios", [])]
+    antennas = [Antenna.from_spec(item, category="antenna") for item in data.get("antennas", [])]
+    batteries = [Battery.from_spec(item, category="battery") for item in data.get("batteries", [])]
+    sensors = [Sensor.from_spec(item, category="sensor") for item in data.get("sensors", [])]
 
     return {
         "hosts": hosts,
@@ -32,7 +57,34 @@ def load_components(path: pathlib.Path = DEFAULT_DATA_PATH) -> Dict[str, List]:
     }
 
 
+def index_components(inventory: Dict[str, List]) -> Dict[str, Dict[str, object]]:
+    """Build per-category ``{id: component}`` lookup tables for ``find_by_id``."""
+
+    return {category: {item.id: item for item in items} for category, items in inventory.items()}
+
+
+def load_catalog_arrays(path: pathlib.Path = DEFAULT_DATA_PATH) -> CatalogArrays:
+    """Cached ``estimator.build_catalog_arrays`` view of ``load_components``."""
+
+    return _load_catalog_arrays(_resolved(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_catalog_arrays(path: pathlib.Path) -> CatalogArrays:
+    return build_catalog_arrays(_load_components(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_component_index(path: pathlib.Path) -> Dict[str, Dict[str, object]]:
+    return index_components(_load_components(path))
+
+
 def find_by_id(items, identifier: str):
+    if isinstance(items, Mapping):
+        try:
+            return items[identifier]
+        except KeyError:
+            raise ValueError(f"No component with id '{identifier}' found") from None
     for item in items:
         if item.id == identifier:
             return item
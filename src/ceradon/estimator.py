@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import functools
+import math
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
-from .models import Antenna, Battery, EstimateResult, Host, NodeBuild, Radio, Sensor
+from .models import Antenna, Battery, Capability, EstimateResult, Host, NodeBuild, Radio, Sensor
 
 # Environment multipliers keep the math lightweight but make intent explicit
 ENVIRONMENT_MULTIPLIERS = {
@@ -21,6 +27,20 @@ BASELINE_RANGE_KM = {
     "analog_fpv_5_8": 1.0,
     "sdr_generic": 0.5,
 }
+DEFAULT_BASELINE_RANGE_KM = 0.3
+
+# Antenna gain buckets (dB, inclusive upper bounds) and their range multipliers
+GAIN_BUCKET_LIMITS_DB = (2, 5, 9, 14)
+GAIN_BUCKET_MULTIPLIERS = (1.0, 1.2, 1.5, 2.5, 3.5)
+
+# Radio-type lookup for everything except WiFi, whose baseline depends on the band
+_RADIO_BASELINE_KM = {
+    "wifi_2_4": BASELINE_RANGE_KM["wifi_2_4"],
+    "wifi_5": BASELINE_RANGE_KM["wifi_5"],
+    "lora": BASELINE_RANGE_KM["lora_0_9"],
+    "analog_fpv": BASELINE_RANGE_KM["analog_fpv_5_8"],
+    "sdr": BASELINE_RANGE_KM["sdr_generic"],
+}
 
 
 def _average_host_power(host: Host) -> float:
@@ -35,40 +55,70 @@ def _average_radio_power(radio: Radio) -> float:
     return radio.power_w or 0.0
 
 
+# Plain-float kernels shared by the per-build estimators and the batch helpers below.
+# Results keep full precision; rounding happens where values are rendered or exported.
+def _power_kernel(host_draw: float, radio_draw: float, sensor_draw: float, environment_factor: float) -> float:
+    return (host_draw + radio_draw + sensor_draw) * environment_factor
+
+
+def _runtime_kernel(capacity_wh: float, load_w: float) -> float:
+    if load_w <= 0:
+        return float("inf")
+    return capacity_wh / load_w
+
+
 def estimate_power(host: Host, radio: Radio, sensors: List[Sensor], environment_factor: float = 1.0) -> float:
     """Approximate draw using average host and radio power plus sensor budget."""
 
-    sensor_draw = sum(sensor.power_w for sensor in sensors)
+    sensor_draw = 0.0
+    for sensor in sensors:
+        sensor_draw += sensor.power_w
     host_draw = _average_host_power(host)
     radio_draw = _average_radio_power(radio)
 
-    total_power = (host_draw + radio_draw + sensor_draw) * environment_factor
-    return round(total_power, 2)
+    return _power_kernel(host_draw, radio_draw, sensor_draw, environment_factor)
 
 
 def estimate_runtime_hours(battery: Battery, load_w: float) -> float:
-    if load_w <= 0:
-        return float("inf")
-    hours = battery.capacity_wh / load_w
-    return round(hours, 2)
+    return _runtime_kernel(battery.capacity_wh, load_w)
+
+
+def estimate_power_batch(
+    host_draws: Sequence[float],
+    radio_draws: Sequence[float],
+    sensor_draws: Sequence[float],
+    environment_factor: float = 1.0,
+) -> List[float]:
+    """``estimate_power`` over parallel columns of pre-averaged draws, for sweeps."""
+
+    return [
+        _power_kernel(host_draw, radio_draw, sensor_draw, environment_factor)
+        for host_draw, radio_draw, sensor_draw in zip(host_draws, radio_draws, sensor_draws)
+    ]
+
 
+def estimate_runtime_batch(capacities_wh: Sequence[float], loads_w: Sequence[float]) -> List[float]:
+    """``estimate_runtime_hours`` over parallel capacity/load columns."""
 
-def _antenna_gain_km_modifier(antenna: Antenna, radio: Radio) -> float:
+    return [_runtime_kernel(capacity_wh, load_w) for capacity_wh, load_w in zip(capacities_wh, loads_w)]
+
+
+def _is_directional(antenna: Antenna) -> bool:
+    return antenna.pattern not in {"omni", "whip"}
+
+
+def _link_multiplier(antenna_gain_dbi: float, radio_gain_db: float, directional: bool) -> float:
     """Bucketed gain mapping to keep results deterministic and readable."""
 
-    gain = antenna.gain_dbi + radio.antenna_gain_db
-    if antenna.pattern not in {"omni", "whip"}:
+    gain = antenna_gain_dbi + radio_gain_db
+    if directional:
         gain += 2.0  # directional boost without full link budget math
 
-    if gain <= 2:
-        return 1.0
-    if gain <= 5:
-        return 1.2
-    if gain <= 9:
-        return 1.5
-    if gain <= 14:
-        return 2.5
-    return 3.5
+    return GAIN_BUCKET_MULTIPLIERS[bisect_left(GAIN_BUCKET_LIMITS_DB, gain)]
+
+
+def _range_kernel(baseline_km: float, link_multiplier: float, environment_factor: float) -> float:
+    return baseline_km * (link_multiplier * environment_factor)
 
 
 def _environment_multiplier(environment: str) -> float:
@@ -81,111 +131,188 @@ def _primary_band(radio: Radio) -> str:
     return radio.band.lower()
 
 
-def estimate_range_km(radio: Radio, antenna: Antenna, environment: str) -> Tuple[float, str]:
-    radio_type = radio.radio_type.lower()
-    band = _primary_band(radio)
-    env_factor = _environment_multiplier(environment)
+def _baseline_range_km(radio: Radio, radio_type: Optional[str] = None) -> Optional[float]:
+    """Open-terrain baseline for the radio, or None when it has no local RF link (cellular)."""
+
+    if radio_type is None:
+        radio_type = radio.radio_type.lower()
+    if radio_type == "cellular":
+        return None
 
     # Baseline selection by radio type and band
+    baseline_key = radio_type
     if radio_type == "wifi":
-        if "2.4" in band:
-            baseline = BASELINE_RANGE_KM["wifi_2_4"]
-        else:
-            baseline = BASELINE_RANGE_KM["wifi_5"]
-    elif radio_type == "lora":
-        baseline = BASELINE_RANGE_KM["lora_0_9"]
-    elif radio_type == "analog_fpv":
-        baseline = BASELINE_RANGE_KM["analog_fpv_5_8"]
-    elif radio_type == "sdr":
-        baseline = BASELINE_RANGE_KM["sdr_generic"]
-    elif radio_type == "cellular":
+        # Primary band tokens lead with the frequency ("2.4 ghz", "5 ghz", ...)
+        baseline_key = "wifi_2_4" if _primary_band(radio).startswith("2.4") else "wifi_5"
+    return _RADIO_BASELINE_KM.get(baseline_key, DEFAULT_BASELINE_RANGE_KM)
+
+
+def estimate_range_km(
+    radio: Radio, antenna: Antenna, environment: str, radio_type: Optional[str] = None
+) -> Tuple[float, str]:
+    baseline = _baseline_range_km(radio, radio_type)
+    if baseline is None:
         text = "Backhaul via 4G/5G network – local RF range depends on client WiFi/USB tether"
         return None, text
-    else:
-        baseline = 0.3
 
-    multiplier = _antenna_gain_km_modifier(antenna, radio) * env_factor
-    range_km = round(baseline * multiplier, 3)
+    link_multiplier = _link_multiplier(antenna.gain_dbi, radio.antenna_gain_db, _is_directional(antenna))
+    range_km = _range_kernel(baseline, link_multiplier, _environment_multiplier(environment))
     return range_km, f"Approx. {range_km:.2f} km in {environment.replace('_', ' ')}"
 
 
-def derive_capabilities(host: Host, radio: Radio, sensors: List[Sensor]) -> Tuple[List[str], List[str]]:
+def _sensor_types(sensors: List[Sensor]) -> AbstractSet[str]:
+    return {sensor.sensor_type.lower() for sensor in sensors}
+
+
+# Radio-specific capability tags and notes, selected by lower-cased radio type; each returns its flags
+def _wifi_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    flags = Capability.WIFI
+    if radio.supports_monitor:
+        capabilities.append("WiFi recon / monitor mode scanning")
+        flags |= Capability.MONITOR
+    else:
+        capabilities.append("WiFi client/backhaul")
+    if radio.supports_csi:
+        capabilities.append("Potential WiFi CSI / channel analysis (driver support required)")
+        flags |= Capability.CSI
+    return flags
+
+
+def _lora_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    capabilities.append("LoRa telemetry / low-rate sensor network")
+    return Capability.LORA
+
+
+def _fpv_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    capabilities.append("Analog FPV video link")
+    return Capability.FPV
+
+
+def _sdr_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    capabilities.append("SDR-based RF capture / analysis")
+    return Capability.SDR
+
+
+def _cellular_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    capabilities.append("Cellular backhaul for remote deployment")
+    notes.append("Assumes LTE/5G coverage for backhaul")
+    return Capability.CELLULAR
+
+
+def _generic_capabilities(radio: Radio, capabilities: List[str], notes: List[str]) -> Capability:
+    capabilities.append(f"{radio.radio_type} link")
+    return Capability(0)
+
+
+_CAPABILITY_DISPATCH = {
+    "wifi": _wifi_capabilities,
+    "lora": _lora_capabilities,
+    "analog_fpv": _fpv_capabilities,
+    "sdr": _sdr_capabilities,
+    "cellular": _cellular_capabilities,
+}
+
+
+def derive_capabilities(
+    host: Host,
+    radio: Radio,
+    sensors: List[Sensor],
+    radio_type: Optional[str] = None,
+    sensor_types: Optional[AbstractSet[str]] = None,
+) -> Tuple[List[str], List[str], Capability]:
+    """Capability tags, fielding notes, and the matching ``Capability`` bitmask."""
+
     capabilities: List[str] = []
     notes: List[str] = []
 
-    radio_type = radio.radio_type.lower()
+    if radio_type is None:
+        radio_type = radio.radio_type.lower()
 
-    if radio_type == "wifi":
-        if radio.supports_monitor:
-            capabilities.append("WiFi recon / monitor mode scanning")
-        else:
-            capabilities.append("WiFi client/backhaul")
-        if radio.supports_csi:
-            capabilities.append("Potential WiFi CSI / channel analysis (driver support required)")
-    elif radio_type == "lora":
-        capabilities.append("LoRa telemetry / low-rate sensor network")
-    elif radio_type == "analog_fpv":
-        capabilities.append("Analog FPV video link")
-    elif radio_type == "sdr":
-        capabilities.append("SDR-based RF capture / analysis")
-    elif radio_type == "cellular":
-        capabilities.append("Cellular backhaul for remote deployment")
-    else:
-        capabilities.append(f"{radio.radio_type} link")
+    if host.cpu_score >= 8 and radio.supports_csi:
+        notes.append("Host strong enough for CSI pose models like WiPose")
+    elif radio.supports_csi:
+        notes.append("CSI available; keep models lightweight (Jetson/RPi)")
+
+    flags = _CAPABILITY_DISPATCH.get(radio_type, _generic_capabilities)(radio, capabilities, notes)
 
-    sensor_types = [sensor.sensor_type.lower() for sensor in sensors]
+    if sensor_types is None:
+        sensor_types = _sensor_types(sensors)
     if "camera" in sensor_types:
         capabilities.append("Video capture")
+        flags |= Capability.VIDEO
     if "gps" in sensor_types:
         capabilities.append("GPS time/position reference")
+        flags |= Capability.GPS
     if "imu" in sensor_types:
         capabilities.append("IMU / motion sensing")
+        flags |= Capability.IMU
     if "environment" in sensor_types or "environmental" in sensor_types:
         capabilities.append("Environmental sensing (temp/humidity)")
+        flags |= Capability.ENVIRONMENTAL
 
-    if host.cpu_score >= 8 and radio.supports_csi:
-        notes.append("Host strong enough for CSI pose models like WiPose")
-    elif radio.supports_csi:
-        notes.append("CSI available; keep models lightweight (Jetson/RPi)")
-
-    if radio_type == "cellular":
-        notes.append("Assumes LTE/5G coverage for backhaul")
-
-    return capabilities, notes
-
-
-def recommended_role(capabilities: List[str], runtime_hours: float, radio: Radio, host: Host, sensors: List[Sensor]) -> str:
-    """Simple, documented heuristics for fielding guidance."""
+    return capabilities, notes, flags
 
-    radio_type = radio.radio_type.lower()
-    has_camera = any(sensor.sensor_type.lower() == "camera" for sensor in sensors)
-    has_wifi_monitor = radio_type == "wifi" and radio.supports_monitor
-    has_wifi_csi = radio_type == "wifi" and radio.supports_csi
-    has_decent_cpu = host.cpu_score >= 6
-    has_high_cpu = host.cpu_score >= 8
 
+# Radio-specific role heuristics; each returns None to fall through to the endurance rules
+def _role_wifi(flags: Capability, host: Host, runtime_hours: float) -> Optional[str]:
+    if runtime_hours < 2:
+        return None
     # WiFi + CSI + compute → experimental CSI / channel analysis
-    if has_wifi_csi and has_high_cpu and runtime_hours >= 2:
+    if flags & Capability.CSI and host.cpu_score >= 8:
         return "Experimental WiFi CSI / channel analysis node"
-
     # WiFi + monitor + decent CPU → recon mapping
-    if has_wifi_monitor and has_decent_cpu and runtime_hours >= 2:
+    if flags & Capability.MONITOR and host.cpu_score >= 6:
         return "Recon / RF mapping node"
+    return None
+
 
+def _role_lora(flags: Capability, host: Host, runtime_hours: float) -> Optional[str]:
     # LoRa + long runtime → perimeter/telemetry
-    if radio_type == "lora" and runtime_hours >= 12:
+    if runtime_hours >= 12:
         return "Low-power perimeter/telemetry node"
+    return None
 
+
+def _role_fpv(flags: Capability, host: Host, runtime_hours: float) -> Optional[str]:
     # Analog FPV + camera → FPV payload
-    if radio_type == "analog_fpv" and has_camera:
+    if flags & Capability.VIDEO:
         return "FPV video relay / payload node"
+    return None
+
 
+def _role_sdr(flags: Capability, host: Host, runtime_hours: float) -> Optional[str]:
     # SDR + compute → RF capture
-    if radio_type == "sdr" and has_decent_cpu:
+    if host.cpu_score >= 6:
         return "RF capture / lab or field survey node"
+    return None
 
-    if radio_type == "cellular":
-        return "Backhaul via LTE/5G; pair with WiFi/USB tether for clients"
+
+def _role_cellular(flags: Capability, host: Host, runtime_hours: float) -> Optional[str]:
+    return "Backhaul via LTE/5G; pair with WiFi/USB tether for clients"
+
+
+# Keyed by the single radio-link bit that derive_capabilities sets
+_ROLE_DISPATCH = {
+    Capability.WIFI: _role_wifi,
+    Capability.LORA: _role_lora,
+    Capability.FPV: _role_fpv,
+    Capability.SDR: _role_sdr,
+    Capability.CELLULAR: _role_cellular,
+}
+_RADIO_LINK_FLAGS = Capability.WIFI | Capability.LORA | Capability.FPV | Capability.SDR | Capability.CELLULAR
+
+
+def recommended_role(flags: Capability, runtime_hours: float, host: Host) -> str:
+    """Simple, documented heuristics for fielding guidance.
+
+    ``flags`` is the bitmask returned by ``derive_capabilities``.
+    """
+
+    role_for_link = _ROLE_DISPATCH.get(flags & _RADIO_LINK_FLAGS)
+    if role_for_link is not None:
+        role = role_for_link(flags, host, runtime_hours)
+        if role is not None:
+            return role
 
     # Fallback based on endurance
     if runtime_hours > 12:
@@ -195,13 +322,64 @@ def recommended_role(capabilities: List[str], runtime_hours: float, radio: Radio
     return "Balanced multi-role field node"
 
 
+# Keywords consumers filter roles by; one compiled alternation scans a role string in a single pass
+ROLE_KEYWORDS = (
+    "csi",
+    "recon",
+    "mapping",
+    "perimeter",
+    "telemetry",
+    "fpv",
+    "video",
+    "relay",
+    "payload",
+    "capture",
+    "survey",
+    "backhaul",
+    "endurance",
+    "isr",
+    "scout",
+    "multi-role",
+)
+_ROLE_KEYWORD_RE = re.compile(r"\b(" + "|".join(map(re.escape, ROLE_KEYWORDS)) + r")\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def role_tags(role: str) -> FrozenSet[str]:
+    """Lower-cased ``ROLE_KEYWORDS`` present in ``role`` (roles come from a small fixed set)."""
+
+    return frozenset(match.lower() for match in _ROLE_KEYWORD_RE.findall(role))
+
+
 def estimate_node(build: NodeBuild) -> EstimateResult:
-    env_factor = _environment_multiplier(build.environment)
-    total_power = estimate_power(build.host, build.radio, build.sensors, env_factor)
-    runtime_hours = estimate_runtime_hours(build.battery, total_power)
-    range_km, range_text = estimate_range_km(build.radio, build.antenna, build.environment)
-    capabilities, notes = derive_capabilities(build.host, build.radio, build.sensors)
-    role = recommended_role(capabilities, runtime_hours, build.radio, build.host, build.sensors)
+    stack = (build.host, build.radio, build.antenna, build.battery, tuple(build.sensors), build.environment)
+    try:
+        hash(stack)
+    except TypeError:
+        # Components built by hand with list fields are unhashable; estimate without caching
+        return _estimate_stack.__wrapped__(*stack)
+    return _estimate_stack(*stack)
+
+
+# Frozen models hash by value, so equal stacks share one cached estimate
+@functools.lru_cache(maxsize=256)
+def _estimate_stack(
+    host: Host,
+    radio: Radio,
+    antenna: Antenna,
+    battery: Battery,
+    sensors: Tuple[Sensor, ...],
+    environment: str,
+) -> EstimateResult:
+    # Lower-cased once and shared by the range, capability, and role helpers
+    radio_type = radio.radio_type.lower()
+    sensor_types = _sensor_types(sensors)
+    env_factor = _environment_multiplier(environment)
+    total_power = estimate_power(host, radio, sensors, env_factor)
+    runtime_hours = estimate_runtime_hours(battery, total_power)
+    range_km, range_text = estimate_range_km(radio, antenna, environment, radio_type)
+    capabilities, notes, flags = derive_capabilities(host, radio, sensors, radio_type, sensor_types)
+    role = recommended_role(flags, runtime_hours, host)
 
     note_text = "; ".join(notes) if notes else None
 
@@ -210,30 +388,162 @@ def estimate_node(build: NodeBuild) -> EstimateResult:
         runtime_hours=runtime_hours,
         range_km=range_km,
         range_text=range_text,
-        capabilities=capabilities,
+        capabilities=tuple(capabilities),
         recommended_role=role,
         notes=note_text,
+        capability_flags=flags,
+        role_tags=role_tags(role),
     )
 
 
+def estimate_nodes_batch(builds: Sequence[NodeBuild]) -> Tuple[List[float], List[float], List[Optional[float]]]:
+    """Power, runtime, and range columns for many builds (search/sweep loops).
+
+    Candidate builds drawn from one catalog share component objects, so host/radio draw
+    and link range are computed once per distinct component (or radio/antenna/environment
+    triple) and reused. Values match ``estimate_node`` for the same build.
+    """
+
+    host_draws: Dict[int, float] = {}
+    radio_draws: Dict[int, float] = {}
+    link_ranges: Dict[Tuple[int, int, str], Optional[float]] = {}
+    powers: List[float] = []
+    runtimes: List[float] = []
+    ranges: List[Optional[float]] = []
+
+    for build in builds:
+        host_draw = host_draws.get(id(build.host))
+        if host_draw is None:
+            host_draw = host_draws[id(build.host)] = _average_host_power(build.host)
+        radio_draw = radio_draws.get(id(build.radio))
+        if radio_draw is None:
+            radio_draw = radio_draws[id(build.radio)] = _average_radio_power(build.radio)
+        sensor_draw = 0.0
+        for sensor in build.sensors:
+            sensor_draw += sensor.power_w
+
+        power = _power_kernel(host_draw, radio_draw, sensor_draw, _environment_multiplier(build.environment))
+        powers.append(power)
+        runtimes.append(_runtime_kernel(build.battery.capacity_wh, power))
+
+        link_key = (id(build.radio), id(build.antenna), build.environment)
+        if link_key not in link_ranges:
+            link_ranges[link_key] = estimate_range_km(build.radio, build.antenna, build.environment)[0]
+        ranges.append(link_ranges[link_key])
+
+    return powers, runtimes, ranges
+
+
+@dataclass(frozen=True)
+class CatalogArrays:
+    """Column-oriented (structure-of-arrays) view of the catalog for ``estimate_sweep``.
+
+    Columns are positionally aligned with the ``load_components`` lists, so a sweep
+    indexes plain floats instead of chasing dataclass attributes. The antenna gain bucket
+    for every radio/antenna pair is resolved up front.
+    """
+
+    index: Dict[str, Dict[str, int]]  # {category: {component id: column position}}
+    host_draw_w: array
+    radio_draw_w: array
+    radio_baseline_km: array  # NaN for radios without a local RF link (cellular)
+    antenna_count: int
+    link_multiplier: array  # gain bucket multiplier, row-major [radio * antenna_count + antenna]
+    battery_capacity_wh: array
+    sensor_power_w: array
+
+
+def build_catalog_arrays(inventory: Dict[str, List]) -> CatalogArrays:
+    radios = inventory["radios"]
+    antennas = inventory["antennas"]
+    baselines = (_baseline_range_km(radio) for radio in radios)
+
+    return CatalogArrays(
+        index={category: {item.id: pos for pos, item in enumerate(items)} for category, items in inventory.items()},
+        host_draw_w=array("d", map(_average_host_power, inventory["hosts"])),
+        radio_draw_w=array("d", map(_average_radio_power, radios)),
+        radio_baseline_km=array("d", (math.nan if baseline is None else baseline for baseline in baselines)),
+        antenna_count=len(antennas),
+        link_multiplier=array(
+            "d",
+            (
+                _link_multiplier(antenna.gain_dbi, radio.antenna_gain_db, directional)
+                for radio in radios
+                for antenna, directional in zip(antennas, map(_is_directional, antennas))
+            ),
+        ),
+        battery_capacity_wh=array("d", (battery.capacity_wh for battery in inventory["batteries"])),
+        sensor_power_w=array("d", (sensor.power_w for sensor in inventory["sensors"])),
+    )
+
+
+def estimate_sweep(
+    arrays: CatalogArrays,
+    host_idxs: Sequence[int],
+    radio_idxs: Sequence[int],
+    antenna_idxs: Sequence[int],
+    battery_idxs: Sequence[int],
+    sensor_idxs: Sequence[int] = (),
+    environment: str = "rural_open",
+) -> Tuple[List[float], List[float], List[Optional[float]]]:
+    """Power, runtime, and range columns for parallel candidate index columns.
+
+    Every candidate carries the same sensor payload and environment. Build a full grid
+    with ``itertools.product`` over the positions in ``arrays.index``. Values match
+    ``estimate_node`` for the equivalent builds.
+    """
+
+    env_factor = _environment_multiplier(environment)
+    sensor_draw = 0.0
+    for idx in sensor_idxs:
+        sensor_draw += arrays.sensor_power_w[idx]
+
+    host_draw_w = arrays.host_draw_w
+    radio_draw_w = arrays.radio_draw_w
+    radio_baseline_km = arrays.radio_baseline_km
+    link_multiplier = arrays.link_multiplier
+    antenna_count = arrays.antenna_count
+    battery_capacity_wh = arrays.battery_capacity_wh
+
+    powers: List[float] = []
+    runtimes: List[float] = []
+    ranges: List[Optional[float]] = []
+    for host_idx, radio_idx, antenna_idx, battery_idx in zip(host_idxs, radio_idxs, antenna_idxs, battery_idxs):
+        power = _power_kernel(host_draw_w[host_idx], radio_draw_w[radio_idx], sensor_draw, env_factor)
+        powers.append(power)
+        runtimes.append(_runtime_kernel(battery_capacity_wh[battery_idx], power))
+
+        baseline = radio_baseline_km[radio_idx]
+        if math.isnan(baseline):
+            ranges.append(None)
+        else:
+            ranges.append(_range_kernel(baseline, link_multiplier[radio_idx * antenna_count + antenna_idx], env_factor))
+
+    return powers, runtimes, ranges
+
+
+# Static report preamble, pre-joined so format_report only formats the variable lines
+_REPORT_HEADER = "\n".join(["Ceradon Node Architect Report", "==============================", "", "Selected stack:"])
+
+
 def format_report(build: NodeBuild, estimate: EstimateResult) -> str:
-    lines = ["Ceradon Node Architect Report", "==============================", ""]
-    lines.append("Selected stack:")
-    for key, value in build.as_dict().items():
-        lines.append(f"- {key.capitalize()}: {value}")
-    lines.append(f"- Environment: {build.environment.replace('_', ' ')}")
-    lines.append("")
-    lines.append("Estimates:")
-    lines.append(f"- Total power draw: {estimate.total_power_w:.2f} W")
-    lines.append(f"- Runtime (est.): {estimate.runtime_hours:.2f} hours")
     if estimate.range_km is not None:
-        lines.append(f"- Link range (est.): {estimate.range_km:.2f} km ({estimate.range_text})")
+        link_line = f"- Link range (est.): {estimate.range_km:.2f} km ({estimate.range_text})"
     else:
-        lines.append(f"- Link capability: {estimate.range_text}")
-    lines.append("- Capabilities:")
-    for cap in estimate.capabilities:
-        lines.append(f"  - {cap}")
-    lines.append(f"- Recommended role: {estimate.recommended_role}")
+        link_line = f"- Link capability: {estimate.range_text}"
+    lines = [
+        _REPORT_HEADER,
+        *[f"- {key.capitalize()}: {value}" for key, value in build.as_dict().items()],
+        f"- Environment: {build.environment.replace('_', ' ')}",
+        "",
+        "Estimates:",
+        f"- Total power draw: {estimate.total_power_w:.2f} W",
+        f"- Runtime (est.): {estimate.runtime_hours:.2f} hours",
+        link_line,
+        "- Capabilities:",
+        *[f"  - {cap}" for cap in estimate.capabilities],
+        f"- Recommended role: {estimate.recommended_role}",
+    ]
     if estimate.notes:
         lines.append(f"- Notes: {estimate.notes}")
     return "\n".join(lines)
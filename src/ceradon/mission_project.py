@@ -5,7 +5,7 @@ import json
 import pathlib
 from typing import Dict, Iterable, List, Optional, Tuple
 
-from .data_loader import find_by_id
+from .data_loader import index_components
 from .models import Host, NodeBuild, Radio, Sensor
 
 SCHEMA_VERSION = "2.0.0"
@@ -17,19 +17,36 @@ BATTERY_CAPACITY_FACTOR = {
     "band_2000_3000": {"hot": 0.9, "temperate": 0.88, "cold": 0.82, "very_cold": 0.76},
     "above_3000": {"hot": 0.85, "temperate": 0.82, "cold": 0.75, "very_cold": 0.7},
 }
+# Single-probe view of BATTERY_CAPACITY_FACTOR keyed by (altitude_band, temperature_band)
+_CAPACITY_FACTOR = {
+    (altitude, temperature): factor
+    for altitude, by_temperature in BATTERY_CAPACITY_FACTOR.items()
+    for temperature, factor in by_temperature.items()
+}
+
+# Location keys copied onto node payloads; band keys are consumed as node environment instead
+_POINT_LOCATION_KEYS = frozenset(("lat", "lon", "elevation_m"))
+
+
+def _point_location(location: Optional[Dict[str, float]]) -> Dict[str, float]:
+    if not location:
+        return {}
+    return {k: v for k, v in location.items() if k in _POINT_LOCATION_KEYS}
 
 
 def _derive_rf_bands(radio: Radio) -> List[str]:
-    if radio.bands:
-        return [band.lower().replace("/", "_") for band in radio.bands]
-    if radio.band:
-        return [radio.band.lower().replace("/", "_")]
-    return []
+    # lower()+replace() beats a str.translate table on these short ASCII band labels
+    bands = radio.bands or ([radio.band] if radio.band else ())
+    return [band.lower().replace("/", "_") for band in bands]
+
+
+def _platform_id(host: Host) -> str:
+    return f"platform-{host.id}"
 
 
 def _build_platform(host: Host) -> Dict:
     return {
-        "id": f"platform-{host.id}",
+        "id": _platform_id(host),
         "name": host.name,
         "role": "compute",
         "origin_tool": "node",
@@ -57,27 +74,30 @@ def _build_node(
     origin_tool: str = "node",
 ) -> Dict:
     rf_bands = _derive_rf_bands(build.radio)
-    cap_factor = BATTERY_CAPACITY_FACTOR.get(altitude_band, {}).get(temperature_band, 1.0)
-    adjusted_runtime_h = round(estimate.runtime_hours * cap_factor, 2)
+    cap_factor = _CAPACITY_FACTOR.get((altitude_band, temperature_band), 1.0)
+    # Kept at full precision; each payload field below is rounded once as it is written
+    adjusted_runtime_h = estimate.runtime_hours * cap_factor
+    # Read-only after build, so `environment` and `environment_assumptions` share one dict
+    environment = {
+        "propagation": build.environment,
+        "altitude_band": altitude_band,
+        "temperature_band": temperature_band,
+    }
     node_entry = {
         "id": node_id,
         "name": name,
         "origin_tool": origin_tool,
-        "platform_id": f"platform-{build.host.id}",
+        "platform_id": _platform_id(build.host),
         "roles": roles,
         "rf_bands": rf_bands,
         "power_profile": {
-            "estimated_draw_w": estimate.total_power_w,
-            "ideal_runtime_h": estimate.runtime_hours,
-            "adjusted_runtime_h": adjusted_runtime_h,
+            "estimated_draw_w": round(estimate.total_power_w, 2),
+            "ideal_runtime_h": round(estimate.runtime_hours, 2),
+            "adjusted_runtime_h": round(adjusted_runtime_h, 2),
             "capacity_factor": cap_factor,
         },
-        "environment": {
-            "propagation": build.environment,
-            "altitude_band": altitude_band,
-            "temperature_band": temperature_band,
-        },
-        "capabilities": estimate.capabilities,
+        "environment": environment,
+        "capabilities": list(estimate.capabilities),
         "recommended_role": estimate.recommended_role,
         "host_type": {"id": build.host.id, "name": build.host.name, "tags": build.host.tags},
         "radios": [
@@ -107,11 +127,7 @@ def _build_node(
             for sensor in build.sensors
         ],
         "estimated_runtime_min": round(adjusted_runtime_h * 60, 1),
-        "environment_assumptions": {
-            "propagation": build.environment,
-            "altitude_band": altitude_band,
-            "temperature_band": temperature_band,
-        },
+        "environment_assumptions": environment,
         "parts": {
             "host_id": build.host.id,
             "battery_id": build.battery.id,
@@ -131,35 +147,31 @@ def _build_node(
         node_entry.setdefault("mesh_hints", []).append(
             {
                 "band": rf_bands[0] if rf_bands else build.radio.radio_type,
-                "estimated_range_km": estimate.range_km,
+                "estimated_range_km": round(estimate.range_km, 3),
             }
         )
     return node_entry
 
 
-def assemble_node_bundle(
+def _assemble_nodes(
     builds: Iterable[Tuple[str, NodeBuild, object, List[str], str, Dict[str, float]]],
-    altitude_band: str = "band_2000_3000",
-    temperature_band: str = "cold",
-    mission: Optional[Dict] = None,
-    schema_version: str = SCHEMA_VERSION,
-) -> Dict:
-    """Assemble a lightweight MissionProject schema payload with only nodes/platforms.
+    altitude_band: str,
+    temperature_band: str,
+) -> Tuple[List[Dict], List[Dict]]:
+    """Shared platform/node loop for the project and bundle assemblers.
 
-    This keeps the shape aligned to the MissionProject v2.0.0 schema while focusing on
-    the modeled nodes. It is meant for downstream tools that want a clean bundle of
-    nodes without extra mission scaffolding.
+    Per-build ``location`` may override the default altitude/temperature bands.
     """
 
     platforms: Dict[str, Dict] = {}
     nodes: List[Dict] = []
 
     for node_id, build, estimate, roles, label, location in builds:
-        platform_entry = _build_platform(build.host)
-        platforms[platform_entry["id"]] = platform_entry
-        node_location = {k: v for k, v in (location or {}).items() if k in {"lat", "lon", "elevation_m"}}
-        node_altitude = (location or {}).get("altitude_band", altitude_band)
-        node_temperature = (location or {}).get("temperature_band", temperature_band)
+        # Hosts repeat across nodes; only build each platform entry once
+        platform_id = _platform_id(build.host)
+        if platform_id not in platforms:
+            platforms[platform_id] = _build_platform(build.host)
+        location = location or {}
         nodes.append(
             _build_node(
                 node_id=node_id,
@@ -168,18 +180,37 @@ def assemble_node_bundle(
                 estimate=estimate,
                 roles=roles,
                 notes=label,
-                altitude_band=node_altitude,
-                temperature_band=node_temperature,
-                location=node_location,
+                altitude_band=location.get("altitude_band", altitude_band),
+                temperature_band=location.get("temperature_band", temperature_band),
+                location=_point_location(location),
             )
         )
 
+    return list(platforms.values()), nodes
+
+
+def assemble_node_bundle(
+    builds: Iterable[Tuple[str, NodeBuild, object, List[str], str, Dict[str, float]]],
+    altitude_band: str = "band_2000_3000",
+    temperature_band: str = "cold",
+    mission: Optional[Dict] = None,
+    schema_version: str = SCHEMA_VERSION,
+) -> Dict:
+    """Assemble a lightweight MissionProject schema payload with only nodes/platforms.
+
+    This keeps the shape aligned to the MissionProject v2.0.0 schema while focusing on
+    the modeled nodes. It is meant for downstream tools that want a clean bundle of
+    nodes without extra mission scaffolding.
+    """
+
+    platforms, nodes = _assemble_nodes(builds, altitude_band, temperature_band)
+
     return {
         "schemaVersion": schema_version,
         "meta": {"origin_tool": "node"},
         "origin_tool": "node",
         "mission": mission or {},
-        "platforms": list(platforms.values()),
+        "platforms": platforms,
         "nodes": nodes,
     }
 
@@ -194,34 +225,16 @@ def assemble_project(
     schema_version: str = SCHEMA_VERSION,
 ) -> Dict:
     schema_version = schema_version or SCHEMA_VERSION
-    platforms: Dict[str, Dict] = {}
-    nodes: List[Dict] = []
-
-    for node_id, build, estimate, roles, label, location in builds:
-        platform_entry = _build_platform(build.host)
-        platforms[platform_entry["id"]] = platform_entry
-        nodes.append(
-            _build_node(
-                node_id=node_id,
-                name=label or node_id,
-                build=build,
-                estimate=estimate,
-                roles=roles,
-                notes=label,
-                altitude_band=location.get("altitude_band", "band_2000_3000") if location else "band_2000_3000",
-                temperature_band=location.get("temperature_band", "cold") if location else "cold",
-                location={k: v for k, v in (location or {}).items() if k in {"lat", "lon", "elevation_m"}},
-            )
-        )
+    platforms, nodes = _assemble_nodes(builds, "band_2000_3000", "cold")
 
     project = {
-        "schemaVersion": SCHEMA_VERSION if schema_version == SCHEMA_VERSION else schema_version,
+        "schemaVersion": schema_version,
         "origin_tool": "node",
         "generated_at": None,
         "mission": mission or {},
         "environment": environment or {},
         "constraints": constraints or [],
-        "platforms": list(platforms.values()),
+        "platforms": platforms,
         "nodes": nodes,
         "mesh_links": mesh_links or [],
         "kits": kits or [],
@@ -234,36 +247,52 @@ def assemble_project(
 
 
 def parse_project(path: pathlib.Path) -> Dict:
-    with path.open("r", encoding="utf-8") as handle:
-        project = json.load(handle)
+    project = json.loads(path.read_bytes())
     if project.get("schemaVersion") != SCHEMA_VERSION:
         project = upgrade_project_schema(project)
     return project
 
 
-def _match_component(items: List, identifier: str):
-    try:
-        return find_by_id(items, identifier)
-    except ValueError:
-        return None
+def dump_project(project: Dict, compact: bool = False) -> str:
+    """Serialize a MissionProject (or node bundle) in the CLI's export format.
+
+    ``compact`` drops indentation and ASCII escaping for the smallest, fastest encode.
+    """
+
+    if compact:
+        return json.dumps(project, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(project, indent=2)
+
+
+def write_project(project: Dict, path: pathlib.Path, compact: bool = False) -> None:
+    """Write ``dump_project`` output to ``path`` as UTF-8 in a single write."""
+
+    path.write_text(dump_project(project, compact), encoding="utf-8")
 
 
 def project_to_builds(project: Dict, inventory: Dict[str, List]) -> Tuple[List[NodeBuild], List[str]]:
     builds: List[NodeBuild] = []
     warnings: List[str] = []
+    # Built once per project so every node/sensor lookup is a dict probe
+    index = index_components(inventory)
+    hosts = index.get("hosts", {})
+    radios = index.get("radios", {})
+    antennas = index.get("antennas", {})
+    batteries = index.get("batteries", {})
+    sensors_by_id = index.get("sensors", {})
     for node in project.get("nodes", []):
         parts = node.get("parts", {})
-        host = _match_component(inventory.get("hosts", []), parts.get("host_id"))
+        host = hosts.get(parts.get("host_id"))
         radio = None
         antenna = None
         sensors: List[Sensor] = []
         rf_chains = parts.get("rf_chains") or []
         if rf_chains:
-            radio = _match_component(inventory.get("radios", []), rf_chains[0].get("radio_id"))
-            antenna = _match_component(inventory.get("antennas", []), rf_chains[0].get("antenna_id"))
-        battery = _match_component(inventory.get("batteries", []), parts.get("battery_id"))
+            radio = radios.get(rf_chains[0].get("radio_id"))
+            antenna = antennas.get(rf_chains[0].get("antenna_id"))
+        battery = batteries.get(parts.get("battery_id"))
         for sid in parts.get("sensor_ids", []):
-            sensor = _match_component(inventory.get("sensors", []), sid)
+            sensor = sensors_by_id.get(sid)
             if sensor:
                 sensors.append(sensor)
             else:
@@ -285,35 +314,45 @@ def project_to_builds(project: Dict, inventory: Dict[str, List]) -> Tuple[List[N
     return builds, warnings
 
 
+def _has_latlon(node: Dict) -> bool:
+    loc = node.get("location") or {}
+    return "lat" in loc and "lon" in loc
+
+
+def _node_feature(node: Dict, default_origin: str) -> Dict:
+    loc = node["location"]
+    coordinates = [loc["lon"], loc["lat"]]
+    if "elevation_m" in loc:
+        coordinates.append(loc["elevation_m"])
+    power_profile = node.get("power_profile") or {}
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": coordinates},
+        "properties": {
+            "id": node.get("id"),
+            "name": node.get("name"),
+            "origin_tool": node.get("origin_tool", default_origin),
+            "roles": node.get("roles", []),
+            "recommended_role": node.get("recommended_role"),
+            "rf_bands": node.get("rf_bands", []),
+            "power_draw_w": power_profile.get("estimated_draw_w"),
+            "runtime_h": power_profile.get("adjusted_runtime_h"),
+        },
+    }
+
+
 def to_geojson(project: Dict) -> Dict:
-    features: List[Dict] = []
+    default_origin = project.get("origin_tool", "node")
+    nodes = project.get("nodes", [])
+    features: List[Dict] = [_node_feature(node, default_origin) for node in nodes if _has_latlon(node)]
 
-    node_lookup = {node.get("id"): node for node in project.get("nodes", [])}
+    mesh_links = project.get("mesh_links")
+    if not mesh_links:
+        return {"type": "FeatureCollection", "features": features}
 
-    for node in project.get("nodes", []):
-        loc = node.get("location") or {}
-        if "lat" in loc and "lon" in loc:
-            coordinates = [loc["lon"], loc["lat"]]
-            if "elevation_m" in loc:
-                coordinates.append(loc["elevation_m"])
-            features.append(
-                {
-                    "type": "Feature",
-                    "geometry": {"type": "Point", "coordinates": coordinates},
-                    "properties": {
-                        "id": node.get("id"),
-                        "name": node.get("name"),
-                        "origin_tool": node.get("origin_tool", project.get("origin_tool", "node")),
-                        "roles": node.get("roles", []),
-                        "recommended_role": node.get("recommended_role"),
-                        "rf_bands": node.get("rf_bands", []),
-                        "power_draw_w": (node.get("power_profile") or {}).get("estimated_draw_w"),
-                        "runtime_h": (node.get("power_profile") or {}).get("adjusted_runtime_h"),
-                    },
-                }
-            )
+    node_lookup = {node.get("id"): node for node in nodes}
 
-    for link in project.get("mesh_links", []):
+    for link in mesh_links:
         start = node_lookup.get(link.get("from_node", ""), {}).get("location")
         end = node_lookup.get(link.get("to_node", ""), {}).get("location")
         if start and end and "lat" in start and "lon" in start and "lat" in end and "lon" in end:
@@ -329,7 +368,7 @@ def to_geojson(project: Dict) -> Dict:
                     },
                     "properties": {
                         "id": link.get("id"),
-                        "origin_tool": link.get("origin_tool", project.get("origin_tool", "node")),
+                        "origin_tool": link.get("origin_tool", default_origin),
                         "band": link.get("band"),
                         "estimated_range_km": link.get("estimated_range_km"),
                     },
@@ -339,26 +378,24 @@ def to_geojson(project: Dict) -> Dict:
     return {"type": "FeatureCollection", "features": features}
 
 
+def _cot_event(node: Dict, default_origin: str) -> Dict:
+    loc = node["location"]
+    return {
+        "uid": node.get("id"),
+        "type": "a-f-G-U-C",
+        "how": "m-g",
+        "lat": loc["lat"],
+        "lon": loc["lon"],
+        "hae": loc.get("elevation_m"),
+        "name": node.get("name"),
+        "role": node.get("recommended_role"),
+        "remarks": f"rf: {','.join(node.get('rf_bands', []))} | origin: {node.get('origin_tool', default_origin)}",
+    }
+
+
 def to_cot_stub(project: Dict) -> List[Dict]:
-    events: List[Dict] = []
-    for node in project.get("nodes", []):
-        loc = node.get("location") or {}
-        if "lat" not in loc or "lon" not in loc:
-            continue
-        events.append(
-            {
-                "uid": node.get("id"),
-                "type": "a-f-G-U-C",
-                "how": "m-g",
-                "lat": loc["lat"],
-                "lon": loc["lon"],
-                "hae": loc.get("elevation_m"),
-                "name": node.get("name"),
-                "role": node.get("recommended_role"),
-                "remarks": f"rf: {','.join(node.get('rf_bands', []))} | origin: {node.get('origin_tool', project.get('origin_tool', 'node'))}",
-            }
-        )
-    return events
+    default_origin = project.get("origin_tool", "node")
+    return [_cot_event(node, default_origin) for node in project.get("nodes", []) if _has_latlon(node)]
 
 
 def merge_unknown_fields(original: Dict, updated: Dict) -> Dict:
@@ -368,7 +405,8 @@ def merge_unknown_fields(original: Dict, updated: Dict) -> Dict:
 
 
 def upgrade_project_schema(project: Dict) -> Dict:
-    legacy = copy.deepcopy(project)
+    # `legacy` is only read; `upgraded` is the single private copy that gets returned
+    legacy = project
     upgraded = copy.deepcopy(project)
 
     upgraded["schemaVersion"] = SCHEMA_VERSION
@@ -396,4 +434,5 @@ def upgrade_project_schema(project: Dict) -> Dict:
             if host_id:
                 node["host_type"] = {"id": host_id, "name": parts.get("host_name", host_id), "tags": parts.get("host_tags", [])}
 
-    return merge_unknown_fields(project, upgraded)
+    # upgraded started as a deep copy of project, so unknown fields are already carried over
+    return upgraded
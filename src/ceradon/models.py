@@ -1,44 +1,87 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import sys
+from dataclasses import dataclass
+from enum import IntFlag
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Sequence, Tuple
 
+# Slotted dataclasses (3.10+) drop the per-instance __dict__ for every model below
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+class Capability(IntFlag):
+    """Bitmask mirror of the capability tags produced by the estimator."""
+
+    WIFI = 1
+    MONITOR = 2
+    CSI = 4
+    LORA = 8
+    FPV = 16
+    SDR = 32
+    CELLULAR = 64
+    VIDEO = 128
+    GPS = 256
+    IMU = 512
+    ENVIRONMENTAL = 1024
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Component:
     id: str
     name: str
     category: str
     power_w: float = 0.0
-    tags: List[str] = field(default_factory=list)
+    # Sequence fields hold tuples (shared empty default) so frozen models stay hashable
+    tags: Sequence[str] = ()
     notes: str = ""
 
+    # Vocabulary fields (categories, bands, types) repeat across the catalog; interning them
+    # lets filters and role lookups compare by identity.
+    _INTERNED = ("category",)
+
+    def __post_init__(self):
+        for name in self._INTERNED:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+
+    @classmethod
+    def from_spec(cls, spec: Mapping[str, Any], **overrides: Any):
+        """Build a component from a catalog entry, converting JSON lists to tuples."""
+
+        fields = {key: tuple(value) if type(value) is list else value for key, value in spec.items()}
+        fields.update(overrides)
+        return cls(**fields)
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Host(Component):
     cpu: str = ""
     ram_gb: float = 0.0
     storage: str = ""
     os: str = "Linux"
-    ports: List[str] = field(default_factory=list)
+    ports: Sequence[str] = ()
     weight_kg: float = 0.0
     cpu_score: float = 0.0  # coarse performance indicator 1-10
     power_w_idle: float = 0.0
     power_w_load: float = 0.0
-    os_options: List[str] = field(default_factory=list)
+    os_options: Sequence[str] = ()
     max_rf_chains: int = 2
 
+    _INTERNED = ("category", "os")
+
     def __post_init__(self):
+        Component.__post_init__(self)
         if self.power_w == 0.0 and self.power_w_idle and self.power_w_load:
-            self.power_w = (self.power_w_idle + self.power_w_load) / 2
+            object.__setattr__(self, "power_w", (self.power_w_idle + self.power_w_load) / 2)
         if not self.os_options and self.os:
-            self.os_options = [self.os]
+            object.__setattr__(self, "os_options", (self.os,))
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Radio(Component):
     band: str = ""
-    bands: List[str] = field(default_factory=list)
+    bands: Sequence[str] = ()
     type: str = ""  # optional alias for radio_type
     radio_type: str = ""
     modulation: str = ""
@@ -50,80 +93,98 @@ class Radio(Component):
     power_w_rx: float = 0.0
     typ_tx_power_dbm: float = 0.0
 
+    _INTERNED = ("category", "band", "radio_type", "modulation")
+
     def __post_init__(self):
         if not self.radio_type and self.type:
-            self.radio_type = self.type
+            object.__setattr__(self, "radio_type", self.type)
         if not self.band and self.bands:
-            self.band = ",".join(self.bands)
+            object.__setattr__(self, "band", ",".join(self.bands))
         if not self.bands and self.band:
-            self.bands = [b.strip() for b in self.band.split("/") if b]
+            object.__setattr__(self, "bands", tuple(b.strip() for b in self.band.split("/") if b))
         if self.power_w == 0.0 and self.power_w_tx and self.power_w_rx:
-            self.power_w = (self.power_w_tx + self.power_w_rx) / 2
+            object.__setattr__(self, "power_w", (self.power_w_tx + self.power_w_rx) / 2)
+        Component.__post_init__(self)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Antenna(Component):
     gain_db: float = 0.0
     gain_dbi: float = 0.0
     pattern: str = "omni"
     polarization: str = ""
-    bands_supported: List[str] = field(default_factory=list)
+    bands_supported: Sequence[str] = ()
+
+    _INTERNED = ("category", "pattern", "polarization")
 
     def __post_init__(self):
+        Component.__post_init__(self)
         if self.gain_db == 0.0 and self.gain_dbi:
-            self.gain_db = self.gain_dbi
+            object.__setattr__(self, "gain_db", self.gain_dbi)
         if self.gain_dbi == 0.0 and self.gain_db:
-            self.gain_dbi = self.gain_db
+            object.__setattr__(self, "gain_dbi", self.gain_db)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Battery(Component):
     capacity_wh: float = 0.0
     chemistry: str = ""
     output_voltage: float = 12.0
     mass_kg: float = 0.0
 
+    _INTERNED = ("category", "chemistry")
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Sensor(Component):
     sensor_type: str = ""
     type: str = ""
     interface: str = ""
 
+    _INTERNED = ("category", "sensor_type")
+
     def __post_init__(self):
         if not self.sensor_type and self.type:
-            self.sensor_type = self.type
+            object.__setattr__(self, "sensor_type", self.type)
+        Component.__post_init__(self)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class NodeBuild:
     host: Host
     radio: Radio
     antenna: Antenna
     battery: Battery
-    sensors: List[Sensor] = field(default_factory=list)
+    sensors: Sequence[Sensor] = ()
     environment: str = "rural_open"
 
+    def __post_init__(self):
+        object.__setattr__(self, "sensors", tuple(self.sensors))
+        if type(self.environment) is str:
+            object.__setattr__(self, "environment", sys.intern(self.environment))
+
     def as_dict(self) -> Dict[str, str]:
         return {
             "host": self.host.name,
             "radio": self.radio.name,
             "antenna": self.antenna.name,
             "battery": self.battery.name,
-            "sensors": ", ".join(sensor.name for sensor in self.sensors) or "None",
+            "sensors": ", ".join([sensor.name for sensor in self.sensors]) or "None",
             "environment": self.environment,
         }
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class EstimateResult:
     total_power_w: float
     runtime_hours: float
     range_km: Optional[float]
     range_text: Optional[str]
-    capabilities: List[str]
+    capabilities: Tuple[str, ...]
     recommended_role: str
     notes: Optional[str] = None
+    capability_flags: Capability = Capability(0)  # bitmask twin of ``capabilities``
+    role_tags: FrozenSet[str] = frozenset()  # ``estimator.ROLE_KEYWORDS`` found in the role
 
     def as_dict(self) -> Dict[str, str]:
         return {
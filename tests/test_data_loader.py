@@ -0,0 +1,46 @@
+import pytest
+
+from ceradon.data_loader import find_by_id, index_components, load_components
+from ceradon.models import Antenna, Host, Radio, Sensor
+
+
+def test_find_by_id_index_matches_linear_scan():
+    inventory = load_components()
+    index = index_components(inventory)
+
+    for category, items in inventory.items():
+        for item in items:
+            assert find_by_id(index[category], item.id) is find_by_id(items, item.id)
+
+    with pytest.raises(ValueError):
+        find_by_id(index["hosts"], "no_such_host")
+
+
+def test_from_spec_matches_direct_construction():
+    radio_spec = {"id": "r", "name": "r", "type": "lora", "band": "868/915", "power_w_tx": 1.0, "power_w_rx": 0.5}
+    radio = Radio.from_spec(radio_spec, category="radio")
+    assert radio == Radio(**radio_spec, category="radio")
+    assert radio.radio_type == "lora"
+    assert radio.bands == ("868", "915")
+    assert radio.power_w == 0.75
+
+    host_spec = {"id": "h", "name": "h", "power_w_idle": 2.0, "power_w_load": 4.0, "ports": ["usb"]}
+    host = Host.from_spec(host_spec, category="host")
+    assert host == Host(**{**host_spec, "ports": ("usb",)}, category="host")
+    assert host.power_w == 3.0
+
+    antenna = Antenna.from_spec({"id": "a", "name": "a", "gain_dbi": 5.0}, category="antenna")
+    assert antenna == Antenna(id="a", name="a", category="antenna", gain_dbi=5.0)
+    assert antenna.gain_db == antenna.gain_dbi == 5.0
+
+    sensor = Sensor.from_spec({"id": "s", "name": "s", "type": "gps"}, category="sensor")
+    assert sensor == Sensor(id="s", name="s", category="sensor", type="gps")
+    assert sensor.sensor_type == "gps"
+
+
+def test_catalog_components_are_hashable():
+    inventory = load_components()
+    parts = [item for items in inventory.values() for item in items]
+
+    assert len(set(parts)) == len(parts)
+    assert all(type(item.tags) is tuple for item in parts)
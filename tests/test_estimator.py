@@ -1,62 +1,186 @@
+import dataclasses
+import itertools
+import json
 import pathlib
-import os
-import subprocess
-import sys
+import shutil
 
-from ceradon.cli import parse_build
-from ceradon.estimator import estimate_node
+import pytest
+
+from ceradon import cli
+from ceradon.cli import main, parse_build
+from ceradon.data_loader import load_catalog_arrays, load_components
+from ceradon.estimator import (
+    ENVIRONMENT_MULTIPLIERS,
+    estimate_node,
+    estimate_nodes_batch,
+    estimate_power_batch,
+    estimate_runtime_batch,
+    estimate_sweep,
+)
+from ceradon.models import Capability, NodeBuild
 
 
 SAMPLES = pathlib.Path(__file__).resolve().parents[1] / "sample_builds"
 
 
-def test_pose_ready_build():
-    build_path = SAMPLES / "pose_ready.json"
-    build = parse_build(build_path)
+@pytest.fixture(scope="session")
+def sample_builds():
+    # Parsed once per run; tests must treat the builds as read-only
+    return {
+        path.stem: parse_build(path) for path in sorted(SAMPLES.glob("*.json")) if not path.stem.endswith(".mission")
+    }
+
+
+def test_pose_ready_build(sample_builds):
+    build = sample_builds["pose_ready"]
     estimate = estimate_node(build)
 
     assert estimate.total_power_w > 0
     assert estimate.runtime_hours > 0
     assert estimate.range_km is None or estimate.range_km >= 0
-    assert any("CSI" in cap for cap in estimate.capabilities)
-    assert "csi" in estimate.recommended_role.lower()
+    assert Capability.CSI in estimate.capability_flags
+    assert "csi" in estimate.role_tags
     assert estimate.capabilities  # non-empty capability list
 
 
-def test_lora_sensor_node():
-    build_path = SAMPLES / "rural_lora_sensor.json"
-    build = parse_build(build_path)
+def test_lora_sensor_node(sample_builds):
+    build = sample_builds["rural_lora_sensor"]
     estimate = estimate_node(build)
 
     assert estimate.total_power_w > 0
     assert estimate.runtime_hours > 0
-    assert any("LoRa" in cap for cap in estimate.capabilities)
-    assert "telemetry" in estimate.recommended_role.lower()
+    assert Capability.LORA in estimate.capability_flags
+    assert "telemetry" in estimate.role_tags
 
 
-def test_analog_fpv_payload():
-    build_path = SAMPLES / "fpv_relay_payload.json"
-    build = parse_build(build_path)
+def test_analog_fpv_payload(sample_builds):
+    build = sample_builds["fpv_relay_payload"]
     estimate = estimate_node(build)
 
     assert estimate.range_km is not None and estimate.range_km > 0
-    assert any("FPV" in cap for cap in estimate.capabilities)
-    assert "video" in estimate.recommended_role.lower() or "payload" in estimate.recommended_role.lower()
+    assert Capability.FPV in estimate.capability_flags
+    assert estimate.role_tags & {"video", "payload"}
+
+
+def test_cli_list_and_simulate(capsys):
+    assert main(["list"]) == 0
+    assert "HOSTS" in capsys.readouterr().out
+
+    assert main(["simulate", "--preset", "urban_wifi_recon"]) == 0
+    assert "Selected stack" in capsys.readouterr().out
+
+
+def test_import_mission_lists_nodes_with_null_propagation(tmp_path, capsys):
+    project = json.loads((SAMPLES / "whitefrost_demo.mission.json").read_text())
+    for node in project["nodes"]:
+        node["environment"]["propagation"] = None
+    mission_file = tmp_path / "null_propagation.mission.json"
+    mission_file.write_text(json.dumps(project))
+
+    assert main(["import-mission", str(mission_file)]) == 0
+    assert "'environment': None" in capsys.readouterr().out
+
+
+def test_cli_picks_up_presets_added_mid_process(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "PRESET_DIR", tmp_path)
+    shutil.copy(SAMPLES / "pose_ready.json", tmp_path / "first.json")
+    assert main(["presets"]) == 0
+    assert capsys.readouterr().out.startswith("first")
+
+    shutil.copy(SAMPLES / "rural_lora_sensor.json", tmp_path / "second.json")
+    assert main(["simulate", "--preset", "second"]) == 0
+    assert "Selected stack" in capsys.readouterr().out
 
 
-def test_cli_list_and_simulate():
-    env = os.environ.copy()
-    env["PYTHONPATH"] = str(pathlib.Path(__file__).resolve().parents[1] / "src")
+def test_batch_kernels_match_scalar_estimates(sample_builds):
+    builds = [dataclasses.replace(build, environment="urban_outdoor") for build in sample_builds.values()]
+    powers = estimate_power_batch(
+        [build.host.power_w for build in builds],
+        [build.radio.power_w for build in builds],
+        [sum(sensor.power_w for sensor in build.sensors) for build in builds],
+        ENVIRONMENT_MULTIPLIERS["urban_outdoor"],
+    )
+    runtimes = estimate_runtime_batch([build.battery.capacity_wh for build in builds], powers)
+
+    for build, power, runtime in zip(builds, powers, runtimes):
+        estimate = estimate_node(build)
+        assert power == pytest.approx(estimate.total_power_w)
+        assert runtime == pytest.approx(estimate.runtime_hours)
+
+
+def test_estimate_nodes_batch_matches_estimate_node(sample_builds):
+    builds = list(sample_builds.values())
+    builds += builds  # repeated components exercise the per-batch memo
+    powers, runtimes, ranges = estimate_nodes_batch(builds)
+
+    for build, power, runtime, range_km in zip(builds, powers, runtimes, ranges):
+        estimate = estimate_node(build)
+        assert (power, runtime, range_km) == (estimate.total_power_w, estimate.runtime_hours, estimate.range_km)
+
 
-    list_result = subprocess.run(
-        [sys.executable, "-m", "ceradon", "list"], capture_output=True, check=True, env=env
+def test_as_dict_leaves_dataclass_views_untouched(sample_builds):
+    build = sample_builds["pose_ready"]
+    estimate = estimate_node(build)
+
+    for model in (build, estimate):
+        before = dataclasses.asdict(model)
+        model.as_dict()["injected"] = "x"
+        assert "injected" not in model.as_dict()
+        assert dataclasses.asdict(model) == before
+        assert not any(f.name.startswith("_") for f in dataclasses.fields(model))
+
+
+def test_estimate_node_reuses_cached_result_per_stack_and_environment(sample_builds):
+    build = sample_builds["urban_wifi_recon"]
+    estimate = estimate_node(build)
+    assert estimate_node(dataclasses.replace(build)) is estimate
+
+    indoor = estimate_node(dataclasses.replace(build, environment="urban_indoor"))
+    assert indoor is not estimate
+    assert indoor.total_power_w != estimate.total_power_w
+
+    hungrier_radio = dataclasses.replace(build.radio, power_w_tx=build.radio.power_w_tx + 1.0)
+    swapped = estimate_node(dataclasses.replace(build, radio=hungrier_radio))
+    assert swapped is not estimate
+    assert swapped.total_power_w > estimate.total_power_w
+
+
+def test_estimate_node_handles_unhashable_components_and_surfaces_errors(sample_builds):
+    build = sample_builds["urban_wifi_recon"]
+    listed = dataclasses.replace(build, radio=dataclasses.replace(build.radio, tags=list(build.radio.tags)))
+    assert estimate_node(listed) == estimate_node(build)
+
+    broken = dataclasses.replace(build, host=dataclasses.replace(build.host, cpu_score=None))
+    with pytest.raises(TypeError) as excinfo:
+        estimate_node(broken)
+    assert excinfo.value.__context__ is None
+
+
+def test_estimate_sweep_matches_estimate_node():
+    inventory = load_components()
+    arrays = load_catalog_arrays()
+    grid = list(
+        itertools.product(
+            range(len(inventory["hosts"]))[:2],
+            range(len(inventory["radios"])),
+            range(len(inventory["antennas"])),
+            range(len(inventory["batteries"]))[:2],
+        )
     )
-    assert b"HOSTS" in list_result.stdout
+    host_idxs, radio_idxs, antenna_idxs, battery_idxs = zip(*grid)
 
-    sim_result = subprocess.run(
-        [sys.executable, "-m", "ceradon", "simulate", "--preset", "urban_wifi_recon"],
-        capture_output=True,
-        check=True,
-        env=env,
+    powers, runtimes, ranges = estimate_sweep(
+        arrays, host_idxs, radio_idxs, antenna_idxs, battery_idxs, sensor_idxs=(0, 1), environment="urban_outdoor"
     )
-    assert b"Selected stack" in sim_result.stdout
+
+    for (h, r, a, b), power, runtime, range_km in zip(grid, powers, runtimes, ranges):
+        build = NodeBuild(
+            host=inventory["hosts"][h],
+            radio=inventory["radios"][r],
+            antenna=inventory["antennas"][a],
+            battery=inventory["batteries"][b],
+            sensors=inventory["sensors"][:2],
+            environment="urban_outdoor",
+        )
+        estimate = estimate_node(build)
+        assert (power, runtime, range_km) == (estimate.total_power_w, estimate.runtime_hours, estimate.range_km)
@@ -0,0 +1,10 @@
+from ceradon.mission_project import merge_unknown_fields
+
+
+def test_merge_unknown_fields_copies_original():
+    original = {"nodes": [{"id": "a"}], "x_custom": {"keep": True}}
+    merged = merge_unknown_fields(original, {"schemaVersion": "2.0.0"})
+
+    assert merged == {"nodes": [{"id": "a"}], "x_custom": {"keep": True}, "schemaVersion": "2.0.0"}
+    merged["x_custom"]["keep"] = False
+    assert original["x_custom"]["keep"] is True